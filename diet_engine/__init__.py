@@ -0,0 +1,51 @@
+"""Diet recommendation engine.
+
+The core only needs NumPy. pandas is imported when a CSV catalog has to be
+compiled, and Flask only by ``diet_engine.web``.
+"""
+
+from diet_engine.catalog import (
+    CATALOG_COLUMNS,
+    FoodCatalog,
+    catalog_from_columns,
+    load_catalog,
+    sample_catalog,
+)
+from diet_engine.core import (
+    DAYS_OF_WEEK,
+    MEAL_TYPES,
+    build_weekly_plan,
+    calculate_bmi,
+    calculate_calorie_requirements,
+    calculate_daily_nutritional_totals,
+    calculate_weekly_nutritional_totals,
+    categorize_foods_by_meal,
+    filter_foods_by_preferences,
+    generate_weekly_meal_plan,
+    plan_day,
+    plan_meal,
+    replace_meal,
+    score_foods,
+)
+
+__all__ = [
+    "CATALOG_COLUMNS",
+    "DAYS_OF_WEEK",
+    "MEAL_TYPES",
+    "FoodCatalog",
+    "build_weekly_plan",
+    "calculate_bmi",
+    "calculate_calorie_requirements",
+    "calculate_daily_nutritional_totals",
+    "calculate_weekly_nutritional_totals",
+    "catalog_from_columns",
+    "categorize_foods_by_meal",
+    "filter_foods_by_preferences",
+    "generate_weekly_meal_plan",
+    "load_catalog",
+    "plan_day",
+    "plan_meal",
+    "replace_meal",
+    "sample_catalog",
+    "score_foods",
+]
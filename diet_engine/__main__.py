@@ -0,0 +1,91 @@
+"""Generate a weekly meal plan from the command line.
+
+Example:
+    python -m diet_engine --age 30 --weight 70 --height 175 --goal "Muscle Gain" --timing
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from diet_engine.catalog import load_catalog
+from diet_engine.core import build_weekly_plan
+
+DEFAULT_FOOD_DATA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "food_data_3.csv"
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a weekly meal plan")
+    parser.add_argument("--age", type=int, required=True)
+    parser.add_argument("--weight", type=float, required=True, help="kg")
+    parser.add_argument("--height", type=float, required=True, help="cm")
+    parser.add_argument("--gender", default="Male")
+    parser.add_argument("--activity-level", default="Lightly Active")
+    parser.add_argument("--goal", default="Weight Loss")
+    parser.add_argument("--vegetarian", action="store_true")
+    parser.add_argument("--vegan", action="store_true")
+    parser.add_argument("--low-carb", action="store_true")
+    parser.add_argument("--low-fat", action="store_true")
+    parser.add_argument("--high-protein", action="store_true")
+    parser.add_argument("--allergies", default="")
+    parser.add_argument("--food-data", default=DEFAULT_FOOD_DATA)
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="report catalog load and planning time on stderr",
+    )
+    args = parser.parse_args(argv)
+
+    loading = time.perf_counter()
+    foods = load_catalog(args.food_data)
+    planning = time.perf_counter()
+
+    nutrition_req, weekly_plan, nutritional_totals = build_weekly_plan(
+        foods,
+        args.age,
+        args.weight,
+        args.height,
+        gender=args.gender,
+        activity_level=args.activity_level,
+        goal=args.goal,
+        vegetarian=args.vegetarian,
+        vegan=args.vegan,
+        low_carb=args.low_carb,
+        low_fat=args.low_fat,
+        high_protein=args.high_protein,
+        allergies=args.allergies,
+    )
+    done = time.perf_counter()
+
+    if weekly_plan is None:
+        print(
+            "No foods match your dietary preferences and restrictions.", file=sys.stderr
+        )
+        return 1
+
+    json.dump(
+        {
+            "nutrition_req": nutrition_req,
+            "weekly_plan": weekly_plan,
+            "nutritional_totals": nutritional_totals,
+        },
+        sys.stdout,
+        indent=2,
+    )
+    print()
+
+    if args.timing:
+        print(
+            "load %.1f ms, plan %.1f ms"
+            % (1000 * (planning - loading), 1000 * (done - planning)),
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
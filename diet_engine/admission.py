@@ -0,0 +1,155 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of queued"""
+
+    def __init__(self, retry_after):
+        super().__init__("Server is busy, retry after %d seconds" % retry_after)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Cap concurrent plan pipelines and shed requests that would wait too long.
+
+    At most ``max_concurrent`` pipelines run at once and at most ``max_queue``
+    requests wait for a slot. A request is rejected immediately when the queue
+    is full or when the expected wait, estimated from the measured pipeline cost,
+    exceeds ``max_wait`` seconds.
+    """
+
+    def __init__(self, max_concurrent=4, max_queue=16, max_wait=2.0, smoothing=0.2):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.smoothing = smoothing
+        self._condition = threading.Condition()
+        self._running = 0
+        self._waiting = 0
+        self._stage_costs = {}  # stage -> moving average of seconds
+        self._pipeline_cost = 0.05  # Initial guess until the first measurement
+        self._counters = {"admitted": 0, "queued": 0, "shed": 0, "timed_out": 0}
+
+    def under_pressure(self):
+        """Whether a new request would have to queue for a slot"""
+        return self._running >= self.max_concurrent or self._waiting > 0
+
+    def expected_wait(self, position):
+        """Estimate seconds until the request at ``position`` in the queue runs"""
+        return self._pipeline_cost * math.ceil(position / max(1, self.max_concurrent))
+
+    def _retry_after(self):
+        return max(1, math.ceil(self.expected_wait(self._waiting + 1)))
+
+    @contextmanager
+    def slot(self):
+        """Hold a pipeline slot for the duration of the block or raise Overloaded"""
+        with self._condition:
+            if self._running >= self.max_concurrent:
+                position = self._waiting + 1
+                if (
+                    self._waiting >= self.max_queue
+                    or self.expected_wait(position) > self.max_wait
+                ):
+                    self._counters["shed"] += 1
+                    raise Overloaded(self._retry_after())
+
+                self._waiting += 1
+                self._counters["queued"] += 1
+                deadline = time.monotonic() + self.max_wait
+                try:
+                    while self._running >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._counters["timed_out"] += 1
+                            raise Overloaded(self._retry_after())
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            self._running += 1
+            self._counters["admitted"] += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._condition.notify()
+
+    def observe(self, durations):
+        """Fold the stage durations of a finished pipeline into the cost model.
+
+        Stages seen before but missing from ``durations`` (skipped, e.g. on a
+        cache hit) count as zero, so their cost decays instead of sticking.
+        """
+        with self._condition:
+            for stage in set(self._stage_costs) | set(durations):
+                seconds = durations.get(stage, 0.0)
+                previous = self._stage_costs.get(stage, seconds)
+                self._stage_costs[stage] = previous + self.smoothing * (
+                    seconds - previous
+                )
+            self._pipeline_cost = sum(self._stage_costs.values())
+
+    def stats(self):
+        with self._condition:
+            return {
+                "running": self._running,
+                "waiting": self._waiting,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "pipeline_cost_ms": round(self._pipeline_cost * 1000, 2),
+                "stage_cost_ms": {
+                    stage: round(seconds * 1000, 2)
+                    for stage, seconds in self._stage_costs.items()
+                },
+                **self._counters,
+            }
+
+
+class PlanCache:
+    """Small LRU of recent plans or candidate pools keyed by preference signature.
+
+    Bounded by entry count and, when ``max_bytes`` is set, by the sizes
+    passed to put().
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # signature -> (entry, nbytes)
+        self._total_bytes = 0
+
+    def get(self, signature):
+        with self._lock:
+            item = self._entries.get(signature)
+            if item is None:
+                return None
+            self._entries.move_to_end(signature)
+            return item[0]
+
+    def put(self, signature, entry, nbytes=0):
+        with self._lock:
+            old = self._entries.pop(signature, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[signature] = (entry, nbytes)
+            self._total_bytes += nbytes
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+
+    @property
+    def nbytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,172 @@
+import os
+import csv
+import numpy as np
+
+# Columns of the food catalog, in file order
+CATALOG_COLUMNS = [
+    "Food_items",
+    "Category",
+    "Calories",
+    "Fats",
+    "Protein",
+    "Iron",
+    "Carbohydrates",
+    "Fibre",
+    "Sugar",
+    "Meal_Type",
+    "Sodium",
+    "Vegetarian",
+    "Vegan",
+]
+TEXT_COLUMNS = ["Food_items", "Category", "Meal_Type"]
+FLAG_COLUMNS = ["Vegetarian", "Vegan"]
+NUMERIC_COLUMNS = [
+    column
+    for column in CATALOG_COLUMNS
+    if column not in TEXT_COLUMNS and column not in FLAG_COLUMNS
+]
+
+# Bump when the compiled file layout changes so stale caches are rebuilt
+COMPILED_FORMAT_VERSION = 1
+
+
+def normalize_food_name(name):
+    """Normalize a food name so case and spacing differences compare equal"""
+    return " ".join(str(name).lower().split())
+
+
+class FoodCatalog:
+    """Column-oriented table of foods backed by one NumPy array per column"""
+
+    def __init__(self, columns):
+        self.columns = {name: np.asarray(values) for name, values in columns.items()}
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All catalog columns must have the same length")
+        self._length = lengths.pop() if lengths else 0
+        self._derived = {}  # Indexes computed from the columns, see derived()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    @property
+    def empty(self):
+        return self._length == 0
+
+    @property
+    def nbytes(self):
+        arrays = list(self.columns.values()) + list(self._derived.values())
+        return sum(values.nbytes for values in arrays)
+
+    def derived(self, key, compute):
+        """Return an index derived from the columns, computing it once.
+
+        Derived indexes are not carried over by take() or with_column().
+        """
+        values = self._derived.get(key)
+        if values is None:
+            values = self._derived[key] = compute()
+        return values
+
+    def take(self, rows):
+        """Return a catalog with only the given row indices or boolean mask"""
+        return FoodCatalog(
+            {name: values[rows] for name, values in self.columns.items()}
+        )
+
+    def with_column(self, name, values):
+        """Return a catalog with ``name`` added or replaced"""
+        columns = dict(self.columns)
+        columns[name] = values
+        return FoodCatalog(columns)
+
+    def records(self):
+        """Return the rows as a list of plain dicts (JSON-serializable)"""
+        names = list(self.columns)
+        values = [self.columns[name].tolist() for name in names]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def catalog_from_columns(data):
+    """Build a catalog from a dict of column lists, coercing the schema dtypes"""
+    columns = {}
+    for name in CATALOG_COLUMNS:
+        if name in TEXT_COLUMNS:
+            columns[name] = np.asarray(data[name], dtype=str)
+        elif name in FLAG_COLUMNS:
+            columns[name] = np.asarray(data[name], dtype=bool)
+        else:
+            values = np.asarray(data[name])
+            if values.dtype.kind not in "iu":
+                values = values.astype(np.float64)
+            columns[name] = values
+    return FoodCatalog(columns)
+
+
+def compiled_path(csv_path):
+    """Location of the compiled NumPy cache for a CSV catalog"""
+    return os.path.splitext(csv_path)[0] + ".catalog.npz"
+
+
+def save_compiled_catalog(catalog, path):
+    tmp_path = path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        __version__=np.array(COMPILED_FORMAT_VERSION),
+        **catalog.columns,
+    )
+    os.replace(tmp_path, path)
+
+
+def load_compiled_catalog(path):
+    with np.load(path, allow_pickle=False) as compiled:
+        if int(compiled["__version__"]) != COMPILED_FORMAT_VERSION:
+            raise ValueError("Compiled catalog %s has an old format" % path)
+        return FoodCatalog(
+            {name: compiled[name] for name in CATALOG_COLUMNS if name in compiled}
+        )
+
+
+def load_catalog(csv_path):
+    """Load a CSV food catalog, compiling it to a NumPy cache on first use.
+
+    Later loads read the compiled cache with NumPy alone, so pandas is only
+    imported when the CSV is new or has changed.
+    """
+    npz_path = compiled_path(csv_path)
+    try:
+        if os.path.getmtime(npz_path) >= os.path.getmtime(csv_path):
+            return load_compiled_catalog(npz_path)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    from diet_engine.ingest import read_catalog_csv
+
+    catalog = read_catalog_csv(csv_path)
+    try:
+        save_compiled_catalog(catalog, npz_path)
+    except OSError:
+        # A read-only deployment still works, it just recompiles each start
+        pass
+    return catalog
+
+
+def sample_catalog():
+    """Return the small built-in catalog"""
+    from diet_engine.sample_data import SAMPLE_FOODS
+
+    return catalog_from_columns(SAMPLE_FOODS)
+
+
+def write_catalog_csv(catalog, path):
+    """Write a catalog to CSV in this project's schema"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CATALOG_COLUMNS)
+        writer.writerows(zip(*(catalog[column].tolist() for column in CATALOG_COLUMNS)))
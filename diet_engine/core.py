@@ -0,0 +1,364 @@
+import random
+import numpy as np
+
+DAYS_OF_WEEK = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snacks"]
+
+# Meal_Type label in the catalog for each meal of the day
+MEAL_TYPE_LABELS = {
+    "breakfast": "Breakfast",
+    "lunch": "Lunch",
+    "dinner": "Dinner",
+    "snacks": "Snack",
+}
+
+# Number of foods served for each meal of the day
+MEAL_SIZES = {"breakfast": 3, "lunch": 3, "dinner": 3, "snacks": 2}
+
+# Nutrient totals and the catalog column each one is summed from
+NUTRIENT_COLUMNS = {
+    "protein": "Protein",
+    "carbs": "Carbohydrates",
+    "fat": "Fats",
+    "fiber": "Fibre",
+    "calories": "Calories",
+}
+
+
+def calculate_bmi(weight, height):
+    """Calculate BMI from weight (kg) and height (cm)"""
+    height_m = height / 100  # convert cm to m
+    bmi = weight / (height_m * height_m)
+    return round(bmi, 2)
+
+
+def calculate_calorie_requirements(age, weight, height, gender, activity_level, goal):
+    """Calculate calorie and macronutrient requirements"""
+    # Calculate Basal Metabolic Rate (BMR) using Mifflin-St Jeor Equation
+    if gender == "Male":
+        bmr = 10 * weight + 6.25 * height - 5 * age + 5
+    else:
+        bmr = 10 * weight + 6.25 * height - 5 * age - 161
+
+    # Apply activity multiplier
+    activity_multipliers = {
+        "Sedentary": 1.2,
+        "Lightly Active": 1.375,
+        "Moderately Active": 1.55,
+        "Very Active": 1.725,
+        "Extremely Active": 1.9,
+    }
+
+    tdee = bmr * activity_multipliers.get(activity_level, 1.375)
+
+    # Adjust based on goal
+    if goal == "Weight Loss":
+        calories = tdee - 500  # 500 calorie deficit
+    elif goal == "Muscle Gain":
+        calories = tdee + 300  # 300 calorie surplus
+    else:  # Maintenance or General Health
+        calories = tdee
+
+    # Calculate macronutrient ratios based on goal
+    if goal == "Weight Loss":
+        protein_pct = 0.35
+        fat_pct = 0.30
+        carb_pct = 0.35
+    elif goal == "Muscle Gain":
+        protein_pct = 0.30
+        fat_pct = 0.25
+        carb_pct = 0.45
+    else:  # Maintenance or General Health
+        protein_pct = 0.25
+        fat_pct = 0.30
+        carb_pct = 0.45
+
+    # Calculate grams of each macronutrient
+    protein_g = (calories * protein_pct) / 4  # 4 calories per gram of protein
+    fat_g = (calories * fat_pct) / 9  # 9 calories per gram of fat
+    carb_g = (calories * carb_pct) / 4  # 4 calories per gram of carb
+
+    # Estimate fiber needs (14g per 1000 calories is a common recommendation)
+    fiber_g = (calories / 1000) * 14
+
+    return {
+        "calories": round(calories),
+        "protein": round(protein_g),
+        "fat": round(fat_g),
+        "carbs": round(carb_g),
+        "fiber": round(fiber_g),
+    }
+
+
+def lowercase_names(foods):
+    """Lowercased food names, used to match allergies"""
+    return foods.derived("names_lower", lambda: np.char.lower(foods["Food_items"]))
+
+
+def build_catalog_indexes(foods):
+    """Precompute the derived indexes the pipeline uses on a full catalog"""
+    lowercase_names(foods)
+    return foods
+
+
+def filter_foods_by_preferences(
+    foods, vegetarian, vegan, low_carb, low_fat, high_protein, allergies
+):
+    """Filter foods based on dietary preferences and allergies"""
+    keep = np.ones(len(foods), dtype=bool)
+    calories = foods["Calories"] + 0.001
+
+    # Apply dietary restrictions
+    if vegetarian:
+        keep &= foods["Vegetarian"]
+
+    if vegan:
+        keep &= foods["Vegan"]
+
+    # Apply allergies filtering
+    if allergies:
+        names = lowercase_names(foods)
+        for allergy in allergies.split(","):
+            allergy = allergy.strip().lower()
+            if allergy:
+                keep &= np.char.find(names, allergy) < 0
+
+    # Apply low carb preference
+    if low_carb:
+        # Keep foods where carbs are less than 20% of calories
+        keep &= foods["Carbohydrates"] * 4 / calories < 0.2
+
+    # Apply low fat preference
+    if low_fat:
+        # Keep foods where fat is less than 25% of calories
+        keep &= foods["Fats"] * 9 / calories < 0.25
+
+    # Apply high protein preference
+    if high_protein:
+        # Keep foods where protein is more than 25% of calories
+        keep &= foods["Protein"] * 4 / calories > 0.25
+
+    return foods.take(keep)
+
+
+def score_foods(foods, nutrition_req, goal):
+    """Score foods based on nutritional content and user goals"""
+    protein = foods["Protein"]
+    fibre = foods["Fibre"]
+    sugar = foods["Sugar"]
+    calories = foods["Calories"] + 1
+
+    # Score based on goal
+    if goal == "Weight Loss":
+        # For weight loss, prioritize high protein, high fiber, low calorie density
+        score = protein / calories * 20  # Protein per calorie
+        score += fibre / calories * 15  # Fiber per calorie
+        score -= sugar / calories * 10  # Penalize sugar
+
+    elif goal == "Muscle Gain":
+        # For muscle gain, prioritize high protein, adequate carbs, nutrient density
+        score = protein * 0.3  # Value total protein
+        score += foods["Carbohydrates"] * 0.1  # Value carbs but less than protein
+        score += foods["Iron"] * 5  # Value iron for recovery
+
+    elif goal == "General Health":
+        # For general health, prioritize nutrient density, fiber, balanced macros
+        score = fibre * 1.5
+        score += protein * 0.3
+        score -= sugar * 0.2  # Penalize sugar but less than in weight loss
+        score -= foods["Sodium"] * 0.01  # Slightly penalize high sodium
+
+    else:  # Maintenance
+        # For maintenance, balanced scoring
+        score = protein * 0.2
+        score += fibre * 0.8
+        score -= sugar * 0.1
+
+    score = np.asarray(score, dtype=np.float64)
+
+    # Normalize the scores (0-100 range)
+    if len(score):
+        min_score = score.min()
+        max_score = score.max()
+
+        if max_score > min_score:  # Avoid division by zero
+            score = 100 * (score - min_score) / (max_score - min_score)
+
+    return foods.with_column("score", score)
+
+
+def categorize_foods_by_meal(scored_foods):
+    """Categorize foods by meal type"""
+    meal_categories = {meal: [] for meal in MEAL_TYPES}
+
+    # Sort foods by score (descending)
+    order = np.argsort(-scored_foods["score"], kind="stable")
+    sorted_foods = scored_foods.take(order)
+    all_foods = sorted_foods.records()
+
+    # Assign foods to meal categories based on Meal_Type
+    meal_types = np.char.add(np.char.add(",", sorted_foods["Meal_Type"]), ",")
+    for meal, label in MEAL_TYPE_LABELS.items():
+        matches = np.flatnonzero(np.char.find(meal_types, "," + label + ",") >= 0)
+        meal_categories[meal] = [all_foods[i] for i in matches]
+
+    # In case of missing meal type assignments, add top foods to appropriate meals
+    for meal_type in meal_categories:
+        if len(meal_categories[meal_type]) < 5:
+            for food in all_foods:
+                if (
+                    food not in meal_categories[meal_type]
+                    and len(meal_categories[meal_type]) < 5
+                ):
+                    meal_categories[meal_type].append(food)
+
+    return meal_categories
+
+
+def plan_meal(categorized_foods, meal):
+    """Pick a shuffled selection of foods for one meal"""
+    options = categorized_foods[meal].copy()
+    random.shuffle(options)
+    return options[: MEAL_SIZES[meal]]
+
+
+def plan_day(categorized_foods):
+    """Plan all meals of a single day"""
+    return {meal: plan_meal(categorized_foods, meal) for meal in MEAL_TYPES}
+
+
+def generate_weekly_meal_plan(categorized_foods, nutrition_req):
+    """Generate a weekly meal plan from Monday to Sunday"""
+    # Shuffle the options for each day to add variety across the week
+    return {day: plan_day(categorized_foods) for day in DAYS_OF_WEEK}
+
+
+def calculate_daily_nutritional_totals(day_plan):
+    """Calculate nutritional totals for one day of a plan"""
+    daily_totals = {
+        "protein": 0,
+        "carbs": 0,
+        "fat": 0,
+        "fiber": 0,
+        "calories": 0,
+        "meal_calories": {meal: 0 for meal in MEAL_TYPES},
+    }
+
+    for meal, foods in day_plan.items():
+        meal_calories = 0
+        for food in foods:
+            daily_totals["protein"] += food["Protein"]
+            daily_totals["carbs"] += food["Carbohydrates"]
+            daily_totals["fat"] += food["Fats"]
+            daily_totals["fiber"] += food["Fibre"]
+            daily_totals["calories"] += food["Calories"]
+            meal_calories += food["Calories"]
+
+        daily_totals["meal_calories"][meal] = meal_calories
+
+    return daily_totals
+
+
+def calculate_daily_averages(weekly_totals):
+    """Average weekly totals over the seven days of the plan"""
+    return {
+        "protein": round(weekly_totals["protein"] / 7, 1),
+        "carbs": round(weekly_totals["carbs"] / 7, 1),
+        "fat": round(weekly_totals["fat"] / 7, 1),
+        "fiber": round(weekly_totals["fiber"] / 7, 1),
+        "calories": round(weekly_totals["calories"] / 7),
+    }
+
+
+def calculate_weekly_nutritional_totals(weekly_plan):
+    """Calculate nutritional totals for the week and for each day"""
+    # Initialize daily and weekly totals
+    nutritional_totals = {
+        "weekly": {"protein": 0, "carbs": 0, "fat": 0, "fiber": 0, "calories": 0},
+        "daily": {},
+    }
+
+    # Calculate totals for each day
+    for day in DAYS_OF_WEEK:
+        daily_totals = calculate_daily_nutritional_totals(weekly_plan[day])
+
+        # Add to weekly totals
+        for nutrient in nutritional_totals["weekly"]:
+            nutritional_totals["weekly"][nutrient] += daily_totals[nutrient]
+
+        # Store daily totals
+        nutritional_totals["daily"][day] = daily_totals
+
+    # Calculate daily averages
+    nutritional_totals["daily_average"] = calculate_daily_averages(
+        nutritional_totals["weekly"]
+    )
+
+    return nutritional_totals
+
+
+def replace_meal(weekly_plan, nutritional_totals, day, meal, foods):
+    """Swap the foods of one meal and update the totals incrementally.
+
+    Only the replaced meal is summed; the other days and meals are untouched.
+    """
+    old_foods = weekly_plan[day][meal]
+    daily_totals = nutritional_totals["daily"][day]
+
+    for nutrient, column in NUTRIENT_COLUMNS.items():
+        delta = sum(food[column] for food in foods) - sum(
+            food[column] for food in old_foods
+        )
+        daily_totals[nutrient] += delta
+        nutritional_totals["weekly"][nutrient] += delta
+
+    daily_totals["meal_calories"][meal] = sum(food["Calories"] for food in foods)
+    weekly_plan[day][meal] = foods
+
+    nutritional_totals["daily_average"] = calculate_daily_averages(
+        nutritional_totals["weekly"]
+    )
+
+
+def build_weekly_plan(
+    foods,
+    age,
+    weight,
+    height,
+    gender="Male",
+    activity_level="Lightly Active",
+    goal="Weight Loss",
+    vegetarian=False,
+    vegan=False,
+    low_carb=False,
+    low_fat=False,
+    high_protein=False,
+    allergies="",
+):
+    """Run the whole recommendation pipeline for one user.
+
+    Returns (nutrition_req, weekly_plan, nutritional_totals), or None for the
+    plan and totals when no foods match the preferences.
+    """
+    nutrition_req = calculate_calorie_requirements(
+        age, weight, height, gender, activity_level, goal
+    )
+    filtered_foods = filter_foods_by_preferences(
+        foods, vegetarian, vegan, low_carb, low_fat, high_protein, allergies
+    )
+    if filtered_foods.empty:
+        return nutrition_req, None, None
+
+    scored_foods = score_foods(filtered_foods, nutrition_req, goal)
+    categorized_foods = categorize_foods_by_meal(scored_foods)
+    weekly_plan = generate_weekly_meal_plan(categorized_foods, nutrition_req)
+    return nutrition_req, weekly_plan, calculate_weekly_nutritional_totals(weekly_plan)
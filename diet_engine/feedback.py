@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import threading
+import numpy as np
+
+from diet_engine.catalog import normalize_food_name
+
+# Weight added to a user's preference for a food per recorded event
+FEEDBACK_EVENTS = {"like": 1.0, "dislike": -1.0, "ate": 0.25}
+
+# Largest score shift (on the 0-100 score scale) feedback can cause
+FEEDBACK_BIAS_SCALE = 15.0
+
+# Accumulated weight at which the bias reaches ~76% of its maximum
+FEEDBACK_SATURATION = 3.0
+
+
+class UserVector:
+    """Sparse preference vector for one user, stored as parallel arrays.
+
+    ``ids[:size]`` is kept sorted so a food's slot is found by binary search.
+    Updating a food the user already rated costs O(log size); the first event
+    for a new food also shifts the tail of the arrays, O(size). ``size`` is the
+    number of distinct foods that user rated, not the catalog size.
+    """
+
+    __slots__ = ("ids", "weights", "size", "version")
+
+    def __init__(self, capacity=8):
+        self.ids = np.empty(capacity, dtype=np.int32)
+        self.weights = np.zeros(capacity, dtype=np.float32)
+        self.size = 0
+        self.version = 0  # Bumped on every change, so caches can tell it moved
+
+    def add(self, food_id, delta):
+        """Add ``delta`` to a food's weight; O(log size), O(size) for a new food"""
+        self.version += 1
+        position = int(np.searchsorted(self.ids[: self.size], food_id))
+        if position < self.size and self.ids[position] == food_id:
+            self.weights[position] += delta
+            return
+
+        if self.size == len(self.ids):
+            # Double the capacity so reallocations stay rare
+            capacity = 2 * len(self.ids)
+            self.ids = np.concatenate(
+                [self.ids, np.empty(capacity - self.size, np.int32)]
+            )
+            self.weights = np.concatenate(
+                [self.weights, np.zeros(capacity - self.size, np.float32)]
+            )
+
+        # Shift the tail up one slot to keep the ids sorted
+        end = self.size
+        self.ids[position + 1 : end + 1] = self.ids[position:end]
+        self.weights[position + 1 : end + 1] = self.weights[position:end]
+        self.ids[position] = food_id
+        self.weights[position] = delta
+        self.size += 1
+
+
+def truncate_torn_tail(path):
+    """Truncate a log after its last newline, dropping a partially written line"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+
+        # Scan backwards for the end of the last complete line
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            block = f.read(step)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                f.truncate(position - step + newline + 1)
+                return
+            position -= step
+        f.truncate(0)
+
+
+class FeedbackStore:
+    """Per-user food feedback kept in memory and persisted to an append-only log.
+
+    Events are appended to ``events.<generation>.log`` as they arrive. Every
+    ``compact_every`` events the log is rotated and the in-memory vectors are
+    written to ``snapshot.json``, so restarts replay at most one log generation.
+    """
+
+    def __init__(self, log_dir, compact_every=10000):
+        self.log_dir = log_dir
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._food_ids = {}  # normalized food name -> food id
+        self._food_names = []
+        self._users = {}  # user id -> UserVector
+        self._generation = 0
+        self._events_since_compaction = 0
+        self._log_file = None
+        self._load()
+
+    def record(self, user_id, food_name, event):
+        """Record a like, dislike or "ate" event for a user and food"""
+        if event not in FEEDBACK_EVENTS:
+            raise ValueError(
+                "Unknown feedback event '%s'. Expected one of: %s"
+                % (event, ", ".join(FEEDBACK_EVENTS))
+            )
+
+        food = normalize_food_name(food_name)
+        entry = {"u": user_id, "f": food, "e": event, "t": round(time.time(), 3)}
+
+        with self._lock:
+            self._apply(user_id, food, FEEDBACK_EVENTS[event])
+            self._append_to_log(entry)
+            self._events_since_compaction += 1
+            if self._events_since_compaction >= self.compact_every:
+                self._compact()
+
+    def _intern(self, food):
+        food_id = self._food_ids.get(food)
+        if food_id is None:
+            food_id = len(self._food_names)
+            self._food_ids[food] = food_id
+            self._food_names.append(food)
+        return food_id
+
+    def _apply(self, user_id, food, delta):
+        food_id = self._intern(food)
+        vector = self._users.get(user_id)
+        if vector is None:
+            vector = self._users[user_id] = UserVector()
+        vector.add(food_id, delta)
+
+    def food_codes(self, food_names):
+        """Map catalog food names to food ids; -1 for foods without feedback"""
+        # Only foods that received feedback are interned, so the id table grows
+        # with feedback rather than with every catalog scored
+        with self._lock:
+            return np.fromiter(
+                (
+                    self._food_ids.get(normalize_food_name(name), -1)
+                    for name in food_names
+                ),
+                dtype=np.int64,
+                count=len(food_names),
+            )
+
+    def has_feedback(self, user_id):
+        return user_id in self._users
+
+    def version(self, user_id):
+        """Counter that changes whenever the user's feedback changes"""
+        vector = self._users.get(user_id)
+        return 0 if vector is None else vector.version
+
+    def bias(self, user_id, codes):
+        """Return the score adjustment for each food id in ``codes`` (-1 gets none)"""
+        codes = np.asarray(codes)
+        weights = np.zeros(len(codes), dtype=np.float32)
+        with self._lock:
+            vector = self._users.get(user_id)
+            if vector is None:
+                return weights
+            ids = vector.ids[: vector.size]
+            if vector.size:
+                # ids are sorted, so look every code up with one binary search
+                positions = np.minimum(np.searchsorted(ids, codes), vector.size - 1)
+                found = ids[positions] == codes
+                weights[found] = vector.weights[positions[found]]
+
+        return FEEDBACK_BIAS_SCALE * np.tanh(weights / FEEDBACK_SATURATION)
+
+    def user_summary(self, user_id):
+        """Return the non-zero preference weights recorded for a user"""
+        with self._lock:
+            vector = self._users.get(user_id)
+            if vector is None:
+                return {}
+            return {
+                self._food_names[food_id]: round(float(weight), 3)
+                for food_id, weight in zip(
+                    vector.ids[: vector.size], vector.weights[: vector.size]
+                )
+                if weight != 0
+            }
+
+    def _snapshot_path(self):
+        return os.path.join(self.log_dir, "snapshot.json")
+
+    def _log_path(self, generation):
+        return os.path.join(self.log_dir, "events.%d.log" % generation)
+
+    def _append_to_log(self, entry):
+        if self._log_file is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._log_file = open(
+                self._log_path(self._generation), "a", encoding="utf-8"
+            )
+        self._log_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._log_file.flush()
+
+    def _load(self):
+        if not os.path.isdir(self.log_dir):
+            return
+
+        snapshot_path = self._snapshot_path()
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._generation = snapshot["generation"]
+            for food in snapshot["foods"]:
+                self._intern(food)
+            for user_id, (ids, weights) in snapshot["users"].items():
+                for food_id, weight in zip(ids, weights):
+                    self._apply(user_id, self._food_names[food_id], weight)
+
+        # Replay any events logged since the snapshot was written
+        generations = sorted(
+            int(name.split(".")[1])
+            for name in os.listdir(self.log_dir)
+            if name.startswith("events.") and name.endswith(".log")
+        )
+        for generation in generations:
+            if generation < self._generation:
+                continue
+            with open(self._log_path(generation), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Skip a line torn by a crash mid-write
+                        continue
+                    self._apply(entry["u"], entry["f"], FEEDBACK_EVENTS[entry["e"]])
+                    self._events_since_compaction += 1
+            self._generation = generation
+
+        # New events are appended to the current log, so cut off a torn last
+        # line rather than gluing the next event onto it
+        truncate_torn_tail(self._log_path(self._generation))
+
+    def compact(self):
+        """Fold the event log into a fresh snapshot"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        # Rotate first so the snapshot covers every event before the new log
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        old_generation = self._generation
+        self._generation += 1
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        snapshot = {
+            "generation": self._generation,
+            "foods": self._food_names,
+            "users": {
+                user_id: [
+                    vector.ids[: vector.size].tolist(),
+                    vector.weights[: vector.size].tolist(),
+                ]
+                for user_id, vector in self._users.items()
+            },
+        }
+        tmp_path = self._snapshot_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, self._snapshot_path())
+
+        for generation in range(old_generation + 1):
+            if os.path.exists(self._log_path(generation)):
+                os.remove(self._log_path(generation))
+        self._events_since_compaction = 0
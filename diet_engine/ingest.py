@@ -0,0 +1,388 @@
+"""Import food catalogs into this project's schema.
+
+``read_catalog_csv`` reads a catalog that already uses the project schema.
+``ingest`` streams large external nutrient databases (CSV or JSONL) in chunks,
+normalizes and deduplicates them, and writes the compiled catalog
+incrementally:
+
+    python -m diet_engine.ingest foods.csv --out food_data_usda.csv --mapping usda.json
+
+The source is cut into content-defined chunks, so the same rows always land in
+the same chunk even when rows are inserted or removed elsewhere. Each normalized
+chunk is kept in ``<out>.parts/`` under its content digest, and re-imports only
+normalize chunks whose digest is new.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+
+from diet_engine.catalog import (
+    CATALOG_COLUMNS,
+    FLAG_COLUMNS,
+    NUMERIC_COLUMNS,
+    catalog_from_columns,
+    normalize_food_name,
+)
+
+MEAL_TYPE_ALIASES = {
+    "breakfast": ["Breakfast"],
+    "lunch": ["Lunch"],
+    "dinner": ["Dinner"],
+    "snack": ["Snack"],
+    "snacks": ["Snack"],
+    # The planner only matches the four labels, so "all" expands to them
+    "all": ["Breakfast", "Lunch", "Dinner", "Snack"],
+}
+
+ALL_MEAL_TYPES = ",".join(MEAL_TYPE_ALIASES["all"])
+
+TRUE_VALUES = {"true", "t", "yes", "y", "1"}
+
+# Bump when normalization changes so previously compiled chunks are rebuilt
+NORMALIZER_VERSION = 2
+
+
+def read_catalog_csv(path):
+    """Read a food catalog CSV in this project's schema into a FoodCatalog"""
+    # pandas is only needed for parsing, so keep it out of the import path
+    import pandas as pd
+
+    foods_df = pd.read_csv(path)
+    missing = [column for column in CATALOG_COLUMNS if column not in foods_df]
+    if missing:
+        raise ValueError("%s is missing columns: %s" % (path, ", ".join(missing)))
+
+    return catalog_from_columns(
+        {column: foods_df[column].to_numpy() for column in CATALOG_COLUMNS}
+    )
+
+
+class RowNormalizer:
+    """Map source records onto the catalog schema.
+
+    ``mapping`` may contain:
+      "columns":  schema column -> source field (defaults to the same name)
+      "scale":    schema column -> factor applied to numeric values
+      "defaults": schema column -> value used when the source field is empty
+    """
+
+    def __init__(self, mapping=None):
+        mapping = mapping or {}
+        self.columns = {
+            column: mapping.get("columns", {}).get(column, column)
+            for column in CATALOG_COLUMNS
+        }
+        self.scale = mapping.get("scale", {})
+        self.defaults = {"Category": "Other", "Meal_Type": ALL_MEAL_TYPES}
+        self.defaults.update(mapping.get("defaults", {}))
+        self.digest = hashlib.sha1(
+            json.dumps([NORMALIZER_VERSION, mapping], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _field(self, record, column):
+        value = record.get(self.columns[column])
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return self.defaults.get(column)
+        return value
+
+    def normalize(self, record):
+        """Return the schema row for a record, or None if it is unusable"""
+        if not isinstance(record, dict):
+            return None
+        name = self._field(record, "Food_items")
+        if name is None:
+            return None
+        name = " ".join(str(name).split())
+
+        row = {"Food_items": name}
+        row["Category"] = str(self._field(record, "Category")).strip().title()
+        row["Meal_Type"] = self._meal_type(self._field(record, "Meal_Type"))
+
+        for column in NUMERIC_COLUMNS:
+            try:
+                value = float(self._field(record, column) or 0)
+            except (TypeError, ValueError):
+                value = 0.0
+            value *= self.scale.get(column, 1)
+            row[column] = round(value, 3)
+
+        for column in FLAG_COLUMNS:
+            value = self._field(record, column)
+            row[column] = str(value).strip().lower() in TRUE_VALUES
+
+        # Vegan foods are always vegetarian
+        row["Vegetarian"] = row["Vegetarian"] or row["Vegan"]
+        return [row[column] for column in CATALOG_COLUMNS]
+
+    @staticmethod
+    def _meal_type(value):
+        labels = []
+        for token in str(value).replace(";", ",").replace("|", ",").split(","):
+            for label in MEAL_TYPE_ALIASES.get(token.strip().lower(), []):
+                if label not in labels:
+                    labels.append(label)
+        return ",".join(labels) if labels else ALL_MEAL_TYPES
+
+
+class ByteCounter:
+    """Iterate over a text file's lines while counting the bytes read"""
+
+    def __init__(self, f):
+        self.f = f
+        self.bytes_read = 0
+
+    def __iter__(self):
+        for line in self.f:
+            self.bytes_read += len(line.encode("utf-8"))
+            yield line
+
+
+def iter_jsonl_records(f):
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None  # Rejected by the normalizer like a row without a name
+        yield record, line
+
+
+def open_source_records(f, source_format):
+    """Return (layout, records) for a CSV or JSONL stream.
+
+    ``records`` yields (record, stable row text) pairs. ``layout`` names the
+    format and, for CSV, the header, since the same row text maps to different
+    fields under a different header.
+    """
+    if source_format == "jsonl":
+        return "jsonl", iter_jsonl_records(f)
+
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        # An empty file has no header and no records
+        return "csv", iter(())
+    layout = "csv:" + "\x1f".join(header)
+    return layout, (
+        (dict(zip(header, fields)), "\x1f".join(fields)) for fields in reader
+    )
+
+
+def iter_chunks(records, average_rows, min_rows, max_rows, layout=""):
+    """Group records into content-defined chunks.
+
+    A chunk ends after a row whose checksum is divisible by ``average_rows``, so
+    boundaries depend on row content rather than position in the file. The chunk
+    digest also covers ``layout``, so a reordered header never reuses a chunk.
+    """
+
+    def new_digest():
+        return hashlib.sha1(layout.encode("utf-8") + b"\n")
+
+    chunk = []
+    digest = new_digest()
+    for record, text in records:
+        encoded = text.encode("utf-8")
+        chunk.append(record)
+        digest.update(encoded + b"\n")
+        at_boundary = zlib.crc32(encoded) % average_rows == 0
+        if len(chunk) >= max_rows or (at_boundary and len(chunk) >= min_rows):
+            yield digest.hexdigest(), chunk
+            chunk = []
+            digest = new_digest()
+    if chunk:
+        yield digest.hexdigest(), chunk
+
+
+def write_part(path, rows):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    os.replace(tmp_path, path)
+
+
+def ingest(
+    source,
+    out,
+    mapping=None,
+    source_format=None,
+    average_chunk_rows=5000,
+    progress=None,
+    progress_interval=2.0,
+):
+    """Stream ``source`` into a compiled catalog CSV at ``out``.
+
+    Memory use is bounded by one chunk plus a 64-bit hash per unique food name.
+    Returns a report of rows, chunks and throughput.
+    """
+    source_format = source_format or (
+        "jsonl" if source.endswith((".jsonl", ".ndjson")) else "csv"
+    )
+    normalizer = RowNormalizer(mapping)
+    parts_dir = out + ".parts"
+    manifest_path = out + ".manifest.json"
+    os.makedirs(parts_dir, exist_ok=True)
+
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f)
+    reuse_parts = previous.get("normalizer") == normalizer.digest
+
+    report = {
+        "source": source,
+        "out": out,
+        "rows_read": 0,
+        "rows_rejected": 0,
+        "rows_written": 0,
+        "duplicates": 0,
+        "chunks": 0,
+        "chunks_reused": 0,
+    }
+    start = time.perf_counter()
+    last_progress = start
+    seen_names = set()
+    part_names = []
+
+    tmp_out = out + ".tmp"
+    try:
+        with open(source, newline="", encoding="utf-8") as source_file, open(
+            tmp_out, "w", newline="", encoding="utf-8"
+        ) as out_file:
+            counter = ByteCounter(source_file)
+            writer = csv.writer(out_file)
+            writer.writerow(CATALOG_COLUMNS)
+
+            layout, records = open_source_records(counter, source_format)
+            chunks = iter_chunks(
+                records,
+                average_chunk_rows,
+                min_rows=max(1, average_chunk_rows // 4),
+                max_rows=average_chunk_rows * 4,
+                layout=layout,
+            )
+            for chunk_digest, chunk in chunks:
+                report["chunks"] += 1
+                report["rows_read"] += len(chunk)
+                part_name = chunk_digest + ".csv"
+                part_path = os.path.join(parts_dir, part_name)
+                part_names.append(part_name)
+
+                if reuse_parts and os.path.exists(part_path):
+                    report["chunks_reused"] += 1
+                    with open(part_path, newline="", encoding="utf-8") as part_file:
+                        rows = list(csv.reader(part_file))
+                else:
+                    rows = [
+                        row
+                        for row in map(normalizer.normalize, chunk)
+                        if row is not None
+                    ]
+                    write_part(part_path, rows)
+
+                # A part holds the chunk's accepted rows, so reused chunks report
+                # the same rejections as freshly normalized ones
+                report["rows_rejected"] += len(chunk) - len(rows)
+
+                # Keep the first occurrence of each food across the whole catalog
+                for row in rows:
+                    name_key = hash(normalize_food_name(row[0]))
+                    if name_key in seen_names:
+                        report["duplicates"] += 1
+                        continue
+                    seen_names.add(name_key)
+                    writer.writerow(row)
+                    report["rows_written"] += 1
+
+                now = time.perf_counter()
+                if progress is not None and now - last_progress >= progress_interval:
+                    last_progress = now
+                    progress(
+                        "%d rows read (%.1f MB), %d written, %.0f rows/s"
+                        % (
+                            report["rows_read"],
+                            counter.bytes_read / 1e6,
+                            report["rows_written"],
+                            report["rows_read"] / (now - start),
+                        )
+                    )
+    except BaseException:
+        # Leave no partial output behind
+        if os.path.exists(tmp_out):
+            os.remove(tmp_out)
+        raise
+
+    os.replace(tmp_out, out)
+
+    # Drop parts no longer referenced by the source
+    current_parts = set(part_names)
+    for name in os.listdir(parts_dir):
+        if name not in current_parts:
+            os.remove(os.path.join(parts_dir, name))
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"source": source, "normalizer": normalizer.digest, "parts": part_names},
+            f,
+            indent=2,
+        )
+
+    seconds = time.perf_counter() - start
+    report["seconds"] = round(seconds, 3)
+    report["rows_per_second"] = round(report["rows_read"] / max(seconds, 1e-9))
+    report["megabytes_read"] = round(counter.bytes_read / 1e6, 2)
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return round(peak / (1e6 if sys.platform == "darwin" else 1e3), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stream an external nutrient database into a food catalog"
+    )
+    parser.add_argument("source", help="CSV or JSONL file")
+    parser.add_argument("--out", required=True, help="compiled catalog CSV")
+    parser.add_argument(
+        "--mapping", help="JSON file mapping schema columns to source fields"
+    )
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    mapping = None
+    if args.mapping:
+        with open(args.mapping, encoding="utf-8") as f:
+            mapping = json.load(f)
+
+    report = ingest(
+        args.source,
+        args.out,
+        mapping=mapping,
+        source_format=args.format,
+        average_chunk_rows=args.chunk_rows,
+        progress=lambda message: print(message, file=sys.stderr),
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+
+from diet_engine.catalog import load_catalog
+from diet_engine.core import build_catalog_indexes
+
+
+class UnknownCatalog(KeyError):
+    """Raised when a request names a catalog that is not registered"""
+
+
+class CatalogRegistry:
+    """Food catalogs keyed by tenant or region, loaded on first use.
+
+    Loaded catalogs (with their derived indexes) are kept in an LRU bounded by
+    ``max_bytes``. Pinned catalogs are never evicted; when only pinned catalogs
+    remain the registry may exceed its budget, which is reported in stats().
+    """
+
+    def __init__(self, sources, max_bytes=256 * 1024 * 1024, pinned=(), loader=None):
+        self.sources = dict(sources)  # catalog name -> path
+        self.max_bytes = max_bytes
+        self.pinned = set(pinned)
+        self.loader = loader or (lambda name, path: load_catalog(path))
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._entries = OrderedDict()  # catalog name -> (catalog, nbytes)
+        self._total_bytes = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "evicted_bytes": 0,
+            "load_seconds": 0.0,
+        }
+
+    def __contains__(self, name):
+        return name in self.sources
+
+    def register(self, name, path, pinned=False):
+        with self._lock:
+            self.sources[name] = path
+            if pinned:
+                self.pinned.add(name)
+
+    def pin(self, name):
+        with self._lock:
+            self.pinned.add(name)
+
+    def unpin(self, name):
+        with self._lock:
+            self.pinned.discard(name)
+            self._evict()
+
+    def get(self, name):
+        """Return the named catalog, loading it if it is not in memory"""
+        if name not in self.sources:
+            raise UnknownCatalog(name)
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                self._counters["hits"] += 1
+                return entry[0]
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Only one thread loads a given catalog; the others wait and reuse it
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None:
+                    self._entries.move_to_end(name)
+                    self._counters["hits"] += 1
+                    return entry[0]
+
+            start = time.perf_counter()
+            catalog = build_catalog_indexes(self.loader(name, self.sources[name]))
+            load_seconds = time.perf_counter() - start
+
+            with self._lock:
+                nbytes = catalog.nbytes
+                self._entries[name] = (catalog, nbytes)
+                self._total_bytes += nbytes
+                self._counters["misses"] += 1
+                self._counters["load_seconds"] += load_seconds
+                self._evict(keep=name)
+            return catalog
+
+    def _evict(self, keep=None):
+        # Drop least recently used, unpinned catalogs until within budget
+        for name in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if name == keep or name in self.pinned:
+                continue
+            _, nbytes = self._entries.pop(name)
+            self._total_bytes -= nbytes
+            self._counters["evictions"] += 1
+            self._counters["evicted_bytes"] += nbytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                "registered": len(self.sources),
+                "loaded": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "over_budget": self._total_bytes > self.max_bytes,
+                "catalogs": {
+                    name: {"bytes": nbytes, "pinned": name in self.pinned}
+                    for name, (_, nbytes) in self._entries.items()
+                },
+                **self._counters,
+                "load_seconds": round(self._counters["load_seconds"], 3),
+            }
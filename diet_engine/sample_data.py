@@ -0,0 +1,289 @@
+# Small built-in catalog used when no food database file is available
+SAMPLE_FOODS = {
+    "Food_items": [
+        "Chicken Breast",
+        "Salmon",
+        "Lentils",
+        "Brown Rice",
+        "Quinoa",
+        "Spinach",
+        "Broccoli",
+        "Sweet Potato",
+        "Banana",
+        "Oatmeal",
+        "Greek Yogurt",
+        "Eggs",
+        "Tofu",
+        "Almonds",
+        "Avocado",
+        "Whole Wheat Bread",
+        "Apple",
+        "Cottage Cheese",
+        "Black Beans",
+        "Blueberries",
+    ],
+    "Category": [
+        "Protein",
+        "Protein",
+        "Protein",
+        "Grain",
+        "Grain",
+        "Vegetable",
+        "Vegetable",
+        "Vegetable",
+        "Fruit",
+        "Grain",
+        "Dairy",
+        "Protein",
+        "Protein",
+        "Nuts",
+        "Fruit",
+        "Grain",
+        "Fruit",
+        "Dairy",
+        "Protein",
+        "Fruit",
+    ],
+    "Calories": [
+        165,
+        208,
+        230,
+        215,
+        222,
+        23,
+        55,
+        112,
+        105,
+        150,
+        100,
+        78,
+        94,
+        164,
+        234,
+        75,
+        95,
+        120,
+        227,
+        84,
+    ],
+    "Fats": [
+        3.6,
+        13.0,
+        0.8,
+        1.8,
+        3.6,
+        0.4,
+        0.6,
+        0.1,
+        0.4,
+        2.5,
+        0.7,
+        5.3,
+        5.3,
+        14.2,
+        21.0,
+        1.1,
+        0.3,
+        5.0,
+        0.9,
+        0.5,
+    ],
+    "Protein": [
+        31.0,
+        22.0,
+        18.0,
+        5.0,
+        8.1,
+        2.9,
+        3.7,
+        2.0,
+        1.3,
+        5.0,
+        17.0,
+        6.3,
+        10.0,
+        6.0,
+        2.9,
+        4.0,
+        0.5,
+        25.0,
+        15.0,
+        1.1,
+    ],
+    "Iron": [
+        0.9,
+        0.5,
+        6.6,
+        0.8,
+        2.8,
+        2.7,
+        0.7,
+        0.6,
+        0.3,
+        1.7,
+        0.1,
+        1.2,
+        2.7,
+        3.7,
+        0.6,
+        1.4,
+        0.1,
+        0.2,
+        3.6,
+        0.4,
+    ],
+    "Carbohydrates": [
+        0.0,
+        0.0,
+        40.0,
+        45.0,
+        39.0,
+        3.6,
+        11.0,
+        26.0,
+        27.0,
+        27.0,
+        6.0,
+        0.6,
+        2.0,
+        6.0,
+        12.0,
+        13.8,
+        25.0,
+        3.0,
+        41.0,
+        21.0,
+    ],
+    "Fibre": [
+        0.0,
+        0.0,
+        16.0,
+        3.5,
+        5.2,
+        2.2,
+        2.6,
+        3.0,
+        3.1,
+        4.0,
+        0.0,
+        0.0,
+        0.5,
+        3.5,
+        9.8,
+        2.7,
+        4.4,
+        0.0,
+        15.0,
+        3.6,
+    ],
+    "Sugar": [
+        0.0,
+        0.0,
+        2.0,
+        0.7,
+        1.0,
+        0.4,
+        1.7,
+        5.4,
+        14.0,
+        0.0,
+        4.0,
+        0.6,
+        0.0,
+        1.2,
+        0.7,
+        1.5,
+        19.0,
+        3.0,
+        0.5,
+        14.7,
+    ],
+    "Meal_Type": [
+        "Lunch,Dinner",
+        "Lunch,Dinner",
+        "Lunch,Dinner",
+        "All",
+        "All",
+        "All",
+        "Lunch,Dinner",
+        "Lunch,Dinner",
+        "Breakfast,Snack",
+        "Breakfast",
+        "Breakfast,Snack",
+        "Breakfast",
+        "Lunch,Dinner",
+        "Snack",
+        "All",
+        "Breakfast,Snack",
+        "Snack",
+        "Breakfast,Snack",
+        "Lunch,Dinner",
+        "Snack",
+    ],
+    "Sodium": [
+        74,
+        61,
+        4,
+        5,
+        7,
+        79,
+        33,
+        72,
+        1,
+        2,
+        36,
+        62,
+        7,
+        0,
+        7,
+        137,
+        1,
+        457,
+        2,
+        1,
+    ],
+    "Vegetarian": [
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        False,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+    ],
+    "Vegan": [
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        True,
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+        True,
+        False,
+        True,
+        True,
+    ],
+}
@@ -0,0 +1,815 @@
+import os
+import sys
+import json
+import time
+from contextlib import ExitStack, contextmanager
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+    session,
+    stream_with_context,
+)
+from flask_session import Session
+from flask_cors import CORS
+
+from diet_engine.admission import AdmissionController, Overloaded, PlanCache
+from diet_engine.catalog import (
+    load_catalog,
+    sample_catalog,
+    write_catalog_csv,
+)
+from diet_engine.core import (
+    DAYS_OF_WEEK,
+    MEAL_TYPES,
+    calculate_bmi,
+    calculate_calorie_requirements,
+    calculate_daily_averages,
+    calculate_daily_nutritional_totals,
+    calculate_weekly_nutritional_totals,
+    categorize_foods_by_meal,
+    filter_foods_by_preferences,
+    generate_weekly_meal_plan,
+    plan_day,
+    plan_meal,
+    replace_meal,
+    score_foods,
+)
+from diet_engine.feedback import FeedbackStore
+from diet_engine.registry import CatalogRegistry
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CONFIG = {
+    "SESSION_TYPE": "filesystem",  # Can be "redis", "mongodb", etc.
+    "SESSION_PERMANENT": False,
+    "SESSION_USE_SIGNER": True,  # Helps prevent session tampering
+    "SESSION_FILE_DIR": "./flask_sessions",  # Directory to store session files
+    "FOOD_DATA_PATH": os.path.join(PROJECT_DIR, "food_data_3.csv"),
+    # Catalog name -> CSV path; None serves FOOD_DATA_PATH as the default catalog
+    "CATALOGS": None,
+    "DEFAULT_CATALOG": "default",
+    "CATALOG_CACHE_BYTES": 256 * 1024 * 1024,  # Memory budget for loaded catalogs
+    "CATALOG_PINNED": ["default"],  # Catalogs never evicted from memory
+    "FEEDBACK_LOG_DIR": "./feedback_log",  # Append-only per-user feedback log
+    # Admission control for the CPU-heavy plan pipeline
+    "ADMISSION_MAX_CONCURRENT": os.cpu_count() or 4,  # Pipelines run at once
+    "ADMISSION_MAX_QUEUE": 16,  # Requests allowed to wait for a slot
+    "ADMISSION_MAX_WAIT": 2.0,  # Seconds a request may wait before shedding
+    "ADMISSION_DEGRADE": True,  # Serve cached plans while overloaded
+    "PLAN_CACHE_SIZE": 256,
+    "POOL_CACHE_SIZE": 256,  # Categorized candidate foods kept for reuse
+    "POOL_CACHE_BYTES": 64 * 1024 * 1024,  # Memory budget for cached pools
+}
+
+NO_MATCHING_FOODS = "No foods match your dietary preferences and restrictions. Please adjust your preferences."
+
+bp = Blueprint("diet", __name__)
+
+
+class EngineState:
+    """Per-app recommendation state: food catalog, feedback and admission control"""
+
+    def __init__(self, config):
+        self.default_catalog = config["DEFAULT_CATALOG"]
+        sources = config["CATALOGS"] or {self.default_catalog: config["FOOD_DATA_PATH"]}
+        self.catalogs = CatalogRegistry(
+            sources,
+            max_bytes=config["CATALOG_CACHE_BYTES"],
+            pinned=config["CATALOG_PINNED"],
+            loader=self._load_catalog,
+        )
+
+        # Per-user likes, dislikes and "ate it" events used to personalize rankings
+        self.feedback_store = FeedbackStore(config["FEEDBACK_LOG_DIR"])
+
+        self.admission = AdmissionController(
+            max_concurrent=config["ADMISSION_MAX_CONCURRENT"],
+            max_queue=config["ADMISSION_MAX_QUEUE"],
+            max_wait=config["ADMISSION_MAX_WAIT"],
+        )
+        self.plan_cache = PlanCache(max_entries=config["PLAN_CACHE_SIZE"])
+        self.pool_cache = PlanCache(
+            max_entries=config["POOL_CACHE_SIZE"],
+            max_bytes=config["POOL_CACHE_BYTES"],
+        )
+
+    def _load_catalog(self, name, path):
+        # Only the default catalog falls back to the built-in sample data
+        if name == self.default_catalog:
+            return load_food_data(path)
+        return load_catalog(path)
+
+
+def load_food_data(path):
+    """Load the food catalog, falling back to the built-in sample data"""
+    try:
+        food_data = load_catalog(path)
+        print("Food database loaded successfully!")
+    except (OSError, ValueError):
+        print("Creating sample food database...")
+        food_data = sample_catalog()
+
+        # Save the sample data to a CSV file
+        write_catalog_csv(food_data, os.path.join(PROJECT_DIR, "sample_food_data.csv"))
+        print("Sample food database created successfully!")
+    return food_data
+
+
+def create_app(config=None):
+    """Create the Flask app serving the recommendation API and frontend"""
+    app = Flask(
+        __name__,
+        static_folder=os.path.join(PROJECT_DIR, "static"),
+        template_folder=os.path.join(PROJECT_DIR, "templates"),
+    )
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+
+    Session(app)
+    app.secret_key = "diet_recommendation_secret_key"  # For session handling
+    CORS(app)  # Enable CORS for API access
+
+    app.extensions["diet_engine"] = EngineState(app.config)
+    app.register_blueprint(bp)
+    return app
+
+
+def engine_state():
+    return current_app.extensions["diet_engine"]
+
+
+class StageTimer:
+    """Record how long each stage of the plan pipeline takes.
+
+    Re-entering a stage adds to its duration, so per-day work sums up.
+    """
+
+    def __init__(self):
+        self.durations = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed
+
+    def server_timing_header(self):
+        """Format the durations as a Server-Timing header value (milliseconds)"""
+        return ", ".join(
+            "%s;dur=%.2f" % (name, seconds * 1000)
+            for name, seconds in self.durations.items()
+        )
+
+
+def apply_feedback_bias(feedback_store, scored_foods, user_id):
+    """Adjust food scores using the user's recorded feedback"""
+    if not user_id or not feedback_store.has_feedback(user_id):
+        return scored_foods
+
+    codes = feedback_store.food_codes(scored_foods["Food_items"].tolist())
+    return scored_foods.with_column(
+        "score", scored_foods["score"] + feedback_store.bias(user_id, codes)
+    )
+
+
+def preference_signature(
+    goal, vegetarian, vegan, low_carb, low_fat, high_protein, allergies
+):
+    """Key identifying every input that shapes the candidate foods of a plan"""
+    allergies_key = ",".join(
+        sorted(a.strip().lower() for a in allergies.split(",") if a.strip())
+    )
+    return (
+        goal,
+        bool(vegetarian),
+        bool(vegan),
+        bool(low_carb),
+        bool(low_fat),
+        bool(high_protein),
+        allergies_key,
+    )
+
+
+def plan_response(nutrition_req, weekly_plan, nutritional_totals, signature, **extra):
+    """Store a plan in the session and build the JSON response for it.
+
+    ``signature`` is the preference signature the plan was built for, so a
+    later partial update can tell which preferences changed.
+    """
+    session["nutrition_req"] = nutrition_req
+    session["weekly_plan"] = weekly_plan
+    session["nutritional_totals"] = nutritional_totals
+    session["plan_signature"] = signature
+
+    return jsonify(
+        {
+            "success": True,
+            "nutrition_req": nutrition_req,
+            "weekly_plan": weekly_plan,
+            "nutritional_totals": nutritional_totals,
+            **extra,
+        }
+    )
+
+
+def build_visualization_data(nutrition_req, nutritional_totals):
+    """Prepare the chart data shown on the visualization tab"""
+    days = list(nutritional_totals["daily"].keys())
+    return {
+        "macros": {
+            "labels": ["Protein", "Carbs", "Fat"],
+            "values": [
+                nutrition_req["protein"] * 4,  # Convert to calories
+                nutrition_req["carbs"] * 4,
+                nutrition_req["fat"] * 9,
+            ],
+        },
+        "daily_calories": {
+            "labels": days,
+            "values": [nutritional_totals["daily"][day]["calories"] for day in days],
+        },
+        "nutrient_comparison": {
+            "nutrients": ["Protein (g)", "Carbs (g)", "Fat (g)", "Fiber (g)"],
+            "recommended": [
+                nutrition_req["protein"] * 7,  # Weekly recommendations
+                nutrition_req["carbs"] * 7,
+                nutrition_req["fat"] * 7,
+                nutrition_req["fiber"] * 7,
+            ],
+            "actual": [
+                nutritional_totals["weekly"]["protein"],
+                nutritional_totals["weekly"]["carbs"],
+                nutritional_totals["weekly"]["fat"],
+                nutritional_totals["weekly"]["fiber"],
+            ],
+        },
+        "daily_distribution": {
+            "days": days,
+            "meal_types": MEAL_TYPES,
+            "values": [
+                [
+                    nutritional_totals["daily"][day]["meal_calories"][meal]
+                    for day in days
+                ]
+                for meal in MEAL_TYPES
+            ],
+        },
+    }
+
+
+@bp.route("/")
+def index():
+    session.clear()
+    return render_template("index.html")
+
+
+@bp.route("/calculate_bmi", methods=["POST"])
+def calculate_bmi_route():
+    data = request.get_json()
+    weight = float(data.get("weight", 0))
+    height = float(data.get("height", 0))
+
+    if weight <= 0 or height <= 0:
+        return jsonify({"error": "Weight and height must be positive values"}), 400
+
+    bmi = calculate_bmi(weight, height)
+    return jsonify({"bmi": bmi})
+
+
+def parse_plan_request(data, state):
+    """Extract the profile and preferences from a plan request body.
+
+    Raises ValueError with a user-facing message for invalid input.
+    """
+    try:
+        params = {
+            # User data
+            "age": int(data.get("age", 0)),
+            "weight": float(data.get("weight", 0)),
+            "height": float(data.get("height", 0)),
+            "gender": data.get("gender", "Male"),
+            "activity_level": data.get("activity_level", "Lightly Active"),
+            "goal": data.get("goal", "Weight Loss"),
+            # Preferences
+            "vegetarian": data.get("vegetarian", False),
+            "vegan": data.get("vegan", False),
+            "low_carb": data.get("low_carb", False),
+            "low_fat": data.get("low_fat", False),
+            "high_protein": data.get("high_protein", False),
+            "allergies": data.get("allergies", ""),
+            "user_id": str(data.get("user_id") or ""),
+            "catalog": str(data.get("catalog") or state.default_catalog),
+        }
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("Invalid input. Please check your details.")
+
+    if params["age"] <= 0 or params["weight"] <= 0 or params["height"] <= 0:
+        raise ValueError("Age, weight, and height must be positive values")
+
+    for field in ("gender", "activity_level", "goal", "allergies"):
+        if not isinstance(params[field], str):
+            raise ValueError("Invalid input. Please check your details.")
+
+    if params["catalog"] not in state.catalogs:
+        raise ValueError("Unknown food catalog '%s'" % params["catalog"])
+
+    return params
+
+
+def requirements_for(params):
+    return calculate_calorie_requirements(
+        params["age"],
+        params["weight"],
+        params["height"],
+        params["gender"],
+        params["activity_level"],
+        params["goal"],
+    )
+
+
+def signature_for(params):
+    return (params["catalog"],) + preference_signature(
+        params["goal"],
+        params["vegetarian"],
+        params["vegan"],
+        params["low_carb"],
+        params["low_fat"],
+        params["high_protein"],
+        params["allergies"],
+    )
+
+
+def candidates_key(state, params):
+    """Key for cached plans and pools; personalized users get their own entries"""
+    user_id = params["user_id"]
+    if user_id and state.feedback_store.has_feedback(user_id):
+        # New feedback changes the version, so stale entries are never reused
+        version = state.feedback_store.version(user_id)
+        return signature_for(params) + (user_id, version)
+    return signature_for(params)
+
+
+def pool_nbytes(categorized_foods):
+    """Rough in-memory size of categorized food records, for the pool cache"""
+    records = {id(food): food for foods in categorized_foods.values() for food in foods}
+    if not records:
+        return 0
+    sample = next(iter(records.values()))
+    record_bytes = sys.getsizeof(sample) + sum(
+        sys.getsizeof(value) for value in sample.values()
+    )
+    list_bytes = sum(sys.getsizeof(foods) for foods in categorized_foods.values())
+    return len(records) * record_bytes + list_bytes
+
+
+def prepare_candidates(state, params, nutrition_req, timer):
+    """Filter, score and categorize foods; None when no food matches.
+
+    The categorized pools are cached per preference signature (and per user
+    once they have feedback), so repeated and partial plans skip the work.
+    """
+    pool_key = candidates_key(state, params)
+    categorized_foods = state.pool_cache.get(pool_key)
+    if categorized_foods is not None:
+        return categorized_foods
+
+    # Get the requested catalog, loading it if it is not in memory
+    with timer.stage("load"):
+        food_data = state.catalogs.get(params["catalog"])
+
+    # Filter foods based on user preferences
+    with timer.stage("filter"):
+        filtered_foods = filter_foods_by_preferences(
+            food_data,
+            params["vegetarian"],
+            params["vegan"],
+            params["low_carb"],
+            params["low_fat"],
+            params["high_protein"],
+            params["allergies"],
+        )
+
+    if filtered_foods.empty:
+        return None
+
+    # Score foods
+    with timer.stage("score"):
+        scored_foods = score_foods(filtered_foods, nutrition_req, params["goal"])
+
+        # Personalize scores with the user's feedback history
+        scored_foods = apply_feedback_bias(
+            state.feedback_store, scored_foods, params["user_id"]
+        )
+
+    # Categorize foods by meal type
+    with timer.stage("categorize"):
+        categorized_foods = categorize_foods_by_meal(scored_foods)
+
+    state.pool_cache.put(pool_key, categorized_foods, pool_nbytes(categorized_foods))
+    return categorized_foods
+
+
+def observe_pipeline(state, timer):
+    # One-off data loading is not part of the steady-state pipeline cost
+    state.admission.observe(
+        {stage: t for stage, t in timer.durations.items() if stage != "load"}
+    )
+
+
+def overloaded_response(e):
+    response = jsonify({"error": "Server is busy. Please try again shortly."})
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response, 429
+
+
+@bp.route("/generate_weekly_plan", methods=["POST"])
+def generate_weekly_plan_route():
+    state = engine_state()
+    try:
+        params = parse_plan_request(request.get_json(), state)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Calculate nutrition requirements
+    nutrition_req = requirements_for(params)
+    signature = candidates_key(state, params)
+
+    # Under pressure, skip the pipeline and reuse a recent plan generated for
+    # the same preferences
+    if current_app.config["ADMISSION_DEGRADE"] and state.admission.under_pressure():
+        cached = state.plan_cache.get(signature)
+        if cached is not None:
+            weekly_plan, nutritional_totals = cached
+            response = plan_response(
+                nutrition_req, weekly_plan, nutritional_totals, signature_for(params)
+            )
+            response.headers["X-Plan-Mode"] = "cached"
+            return response
+
+    try:
+        with state.admission.slot():
+            timer = StageTimer()
+            categorized_foods = prepare_candidates(state, params, nutrition_req, timer)
+
+            if categorized_foods is None:
+                return jsonify({"error": NO_MATCHING_FOODS}), 400
+
+            # Generate weekly meal plan
+            with timer.stage("plan"):
+                weekly_plan = generate_weekly_meal_plan(
+                    categorized_foods, nutrition_req
+                )
+
+            # Calculate nutritional totals
+            with timer.stage("totals"):
+                nutritional_totals = calculate_weekly_nutritional_totals(weekly_plan)
+
+            # Return the recommendations
+            with timer.stage("serialize"):
+                response = plan_response(
+                    nutrition_req,
+                    weekly_plan,
+                    nutritional_totals,
+                    signature_for(params),
+                )
+
+    except Overloaded as e:
+        return overloaded_response(e)
+
+    except Exception:
+        current_app.logger.exception("Weekly plan generation failed")
+        return (
+            jsonify({"error": "Failed to generate a meal plan. Please try again."}),
+            500,
+        )
+
+    observe_pipeline(state, timer)
+    state.plan_cache.put(signature, (weekly_plan, nutritional_totals))
+
+    response.headers["Server-Timing"] = timer.server_timing_header()
+    response.headers["X-Plan-Mode"] = "full"
+    return response
+
+
+def sse_event(event, data):
+    """Format one server-sent event"""
+    return "event: %s\ndata: %s\n\n" % (event, json.dumps(data))
+
+
+@bp.route("/generate_weekly_plan/stream", methods=["POST"])
+def stream_weekly_plan_route():
+    """Stream a weekly plan as server-sent events, one day at a time.
+
+    Events, in order: "requirements", one "day" per day of the week,
+    "totals", "visualization" and "done". A failure part-way through is
+    reported as an "error" event.
+    """
+    state = engine_state()
+    try:
+        params = parse_plan_request(request.get_json(), state)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    nutrition_req = requirements_for(params)
+    signature = candidates_key(state, params)
+
+    cached = None
+    if current_app.config["ADMISSION_DEGRADE"] and state.admission.under_pressure():
+        cached = state.plan_cache.get(signature)
+
+    # Hold the pipeline slot until the last day is planned. Closing the response
+    # releases it too, in case the client disconnects before that
+    slot = ExitStack()
+    if cached is None:
+        try:
+            slot.enter_context(state.admission.slot())
+        except Overloaded as e:
+            return overloaded_response(e)
+
+    # Store the requirements now so the session cookie is sent with the headers
+    session["nutrition_req"] = nutrition_req
+    session.pop("weekly_plan", None)
+    session.pop("nutritional_totals", None)
+    session.pop("plan_signature", None)
+
+    @stream_with_context
+    def events():
+        yield sse_event("requirements", {"nutrition_req": nutrition_req})
+        try:
+            timer = StageTimer()
+            if cached is not None:
+                categorized_foods = None
+            else:
+                categorized_foods = prepare_candidates(
+                    state, params, nutrition_req, timer
+                )
+                if categorized_foods is None:
+                    yield sse_event("error", {"error": NO_MATCHING_FOODS})
+                    return
+
+            weekly_plan = {}
+            nutritional_totals = {
+                "weekly": {
+                    "protein": 0,
+                    "carbs": 0,
+                    "fat": 0,
+                    "fiber": 0,
+                    "calories": 0,
+                },
+                "daily": {},
+            }
+            for day in DAYS_OF_WEEK:
+                with timer.stage("plan"):
+                    if cached is not None:
+                        weekly_plan[day] = cached[0][day]
+                    else:
+                        weekly_plan[day] = plan_day(categorized_foods)
+
+                with timer.stage("totals"):
+                    daily_totals = calculate_daily_nutritional_totals(weekly_plan[day])
+                    for nutrient in nutritional_totals["weekly"]:
+                        nutritional_totals["weekly"][nutrient] += daily_totals[nutrient]
+                    nutritional_totals["daily"][day] = daily_totals
+
+                # The CPU work is done; do not hold the slot for a slow reader
+                if day == DAYS_OF_WEEK[-1]:
+                    slot.close()
+
+                yield sse_event(
+                    "day",
+                    {
+                        "day": day,
+                        "meals": weekly_plan[day],
+                        "totals": daily_totals,
+                        "weekly_so_far": nutritional_totals["weekly"],
+                    },
+                )
+
+            nutritional_totals["daily_average"] = calculate_daily_averages(
+                nutritional_totals["weekly"]
+            )
+            yield sse_event("totals", {"nutritional_totals": nutritional_totals})
+
+            # The session was saved when the headers went out, so save it again
+            # now that the plan is complete
+            session["weekly_plan"] = weekly_plan
+            session["nutritional_totals"] = nutritional_totals
+            session["plan_signature"] = signature_for(params)
+            current_app.session_interface.save_session(current_app, session, Response())
+
+            if cached is None:
+                observe_pipeline(state, timer)
+                state.plan_cache.put(signature, (weekly_plan, nutritional_totals))
+
+            yield sse_event(
+                "visualization",
+                build_visualization_data(nutrition_req, nutritional_totals),
+            )
+            yield sse_event(
+                "done",
+                {"success": True, "mode": "full" if cached is None else "cached"},
+            )
+
+        except Exception:
+            current_app.logger.exception("Streaming weekly plan generation failed")
+            yield sse_event(
+                "error", {"error": "Failed to generate a meal plan. Please try again."}
+            )
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Disable proxy buffering
+    response.call_on_close(slot.close)
+    return response
+
+
+def parse_regenerate_targets(targets):
+    """Expand [{"day": ..., "meal": ...}] into (day, meal) pairs.
+
+    Omitting "meal" regenerates every meal of the day.
+    """
+    if not isinstance(targets, list) or not targets:
+        raise ValueError("Specify the days or meals to regenerate")
+
+    pairs = []
+    for target in targets:
+        day = target.get("day") if isinstance(target, dict) else None
+        meal = target.get("meal") if isinstance(target, dict) else None
+        if day not in DAYS_OF_WEEK:
+            raise ValueError("Unknown day '%s'" % day)
+        if meal is not None and meal not in MEAL_TYPES:
+            raise ValueError("Unknown meal '%s'" % meal)
+
+        for meal in [meal] if meal else MEAL_TYPES:
+            if (day, meal) not in pairs:
+                pairs.append((day, meal))
+    return pairs
+
+
+def meals_without_candidates(weekly_plan, categorized_foods):
+    """(day, meal) pairs holding a food no longer in that meal's candidate pool"""
+    candidates = {
+        meal: {food["Food_items"] for food in foods}
+        for meal, foods in categorized_foods.items()
+    }
+    return [
+        (day, meal)
+        for day in DAYS_OF_WEEK
+        for meal in MEAL_TYPES
+        if any(
+            food["Food_items"] not in candidates[meal]
+            for food in weekly_plan[day][meal]
+        )
+    ]
+
+
+@bp.route("/weekly_plan", methods=["PATCH"])
+def regenerate_weekly_plan_route():
+    """Regenerate selected days or meals of the plan stored in the session.
+
+    When the preferences differ from those the plan was built for, every meal
+    holding a food the new preferences exclude is regenerated as well.
+    """
+    state = engine_state()
+    weekly_plan = session.get("weekly_plan")
+    nutritional_totals = session.get("nutritional_totals")
+    if not weekly_plan or not nutritional_totals:
+        return (
+            jsonify({"error": "No meal plan to update. Generate a plan first."}),
+            400,
+        )
+
+    try:
+        data = request.get_json()
+        params = parse_plan_request(data, state)
+        targets = parse_regenerate_targets(data.get("regenerate"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    nutrition_req = requirements_for(params)
+
+    try:
+        with state.admission.slot():
+            timer = StageTimer()
+            categorized_foods = prepare_candidates(state, params, nutrition_req, timer)
+
+            if categorized_foods is None:
+                return jsonify({"error": NO_MATCHING_FOODS}), 400
+
+            signature = signature_for(params)
+            if session.get("plan_signature") != signature:
+                with timer.stage("diff"):
+                    targets += [
+                        target
+                        for target in meals_without_candidates(
+                            weekly_plan, categorized_foods
+                        )
+                        if target not in targets
+                    ]
+
+            # Swap only the affected meals and adjust the totals by difference
+            with timer.stage("plan"):
+                for day, meal in targets:
+                    replace_meal(
+                        weekly_plan,
+                        nutritional_totals,
+                        day,
+                        meal,
+                        plan_meal(categorized_foods, meal),
+                    )
+
+            with timer.stage("serialize"):
+                response = plan_response(
+                    nutrition_req,
+                    weekly_plan,
+                    nutritional_totals,
+                    signature,
+                    regenerated=[{"day": day, "meal": meal} for day, meal in targets],
+                )
+
+    except Overloaded as e:
+        return overloaded_response(e)
+
+    except Exception:
+        current_app.logger.exception("Weekly plan regeneration failed")
+        return (
+            jsonify({"error": "Failed to update the meal plan. Please try again."}),
+            500,
+        )
+
+    response.headers["Server-Timing"] = timer.server_timing_header()
+    response.headers["X-Plan-Mode"] = "partial"
+    return response
+
+
+@bp.route("/admission_stats")
+def admission_stats_route():
+    state = engine_state()
+    stats = state.admission.stats()
+    stats["cached_plans"] = len(state.plan_cache)
+    stats["cached_pools"] = len(state.pool_cache)
+    stats["cached_pool_bytes"] = state.pool_cache.nbytes
+    return jsonify(stats)
+
+
+@bp.route("/catalogs")
+def catalogs_route():
+    return jsonify(engine_state().catalogs.stats())
+
+
+@bp.route("/feedback", methods=["POST"])
+def record_feedback_route():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid input. Expected a JSON object."}), 400
+
+    user_id = str(data.get("user_id") or "")
+    food = data.get("food")
+    event = data.get("event")
+
+    if not user_id or not food or not event:
+        return jsonify({"error": "user_id, food and event are required"}), 400
+
+    if not isinstance(food, str) or not isinstance(event, str):
+        return jsonify({"error": "food and event must be strings"}), 400
+
+    try:
+        engine_state().feedback_store.record(user_id, food, event)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"success": True})
+
+
+@bp.route("/feedback/<user_id>")
+def get_feedback_route(user_id):
+    preferences = engine_state().feedback_store.user_summary(user_id)
+    return jsonify({"user_id": user_id, "preferences": preferences})
+
+
+@bp.route("/get_visualizations_data")
+def get_visualizations_data():
+    nutrition_req = session.get("nutrition_req")
+    weekly_plan = session.get("weekly_plan")
+    nutritional_totals = session.get("nutritional_totals")
+
+    if not nutrition_req or not weekly_plan or not nutritional_totals:
+        return (
+            jsonify(
+                {
+                    "error": "No recommendation data available. Generate recommendations first."
+                }
+            ),
+            400,
+        )
+
+    return jsonify(build_visualization_data(nutrition_req, nutritional_totals))
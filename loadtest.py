@@ -0,0 +1,491 @@
+"""Replay plan-generation traffic against a running app and report latency SLOs.
+
+Each simulated user session performs POST /generate_weekly_plan followed by
+GET /get_visualizations_data with the same session cookie, or with --stream
+the single POST /generate_weekly_plan/stream call static/js/main.js makes.
+
+Examples:
+    python loadtest.py --start-app --sessions 200 --concurrency 8 --output run.json
+    python loadtest.py --replay recorded.jsonl --baseline run.json --max-regression 0.1
+
+With --baseline the exit status is 1 on a regression and 2 when the baseline
+was recorded with different concurrency, sessions, workload or mode.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+
+GOALS = ["Weight Loss", "Muscle Gain", "Maintenance", "General Health"]
+ACTIVITY_LEVELS = [
+    "Sedentary",
+    "Lightly Active",
+    "Moderately Active",
+    "Very Active",
+    "Extremely Active",
+]
+GENDERS = ["Male", "Female", "Other"]
+ALLERGENS = ["egg", "milk", "peanut", "almond", "shrimp", "wheat", "soy", "fish"]
+
+# Chance that a synthetic session ticks each preference checkbox
+PREFERENCE_RATES = {
+    "vegetarian": 0.25,
+    "vegan": 0.08,
+    "low_carb": 0.1,
+    "low_fat": 0.1,
+    "high_protein": 0.15,
+}
+
+PERCENTILES = [50, 95, 99]
+
+
+def synthetic_payload(rng):
+    """Build a /generate_weekly_plan body like the frontend form would send"""
+    payload = {
+        "age": rng.randint(18, 75),
+        "gender": rng.choice(GENDERS),
+        "weight": round(rng.uniform(45, 120), 1),
+        "height": round(rng.uniform(150, 200), 1),
+        "activity_level": rng.choice(ACTIVITY_LEVELS),
+        "goal": rng.choice(GOALS),
+    }
+    for flag, rate in PREFERENCE_RATES.items():
+        payload[flag] = rng.random() < rate
+
+    # The frontend forces vegetarian on when vegan is ticked
+    if payload["vegan"]:
+        payload["vegetarian"] = True
+
+    allergy_count = rng.choice([0, 0, 0, 1, 1, 2])
+    payload["allergies"] = ", ".join(rng.sample(ALLERGENS, allergy_count))
+    return payload
+
+
+def load_workload(args):
+    """Return the list of request bodies to send, in order"""
+    if args.replay:
+        workload = []
+        with open(args.replay, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    # Accept both bare bodies and {"payload": {...}} records
+                    workload.append(entry.get("payload", entry))
+        if args.sessions:
+            workload = (workload * (args.sessions // len(workload) + 1))[
+                : args.sessions
+            ]
+        return workload
+
+    rng = random.Random(args.seed)
+    return [synthetic_payload(rng) for _ in range(args.sessions or 100)]
+
+
+def timed_request(opener, method, url, body=None, timeout=30.0):
+    """Send one request and return (status, seconds, server stage timings)"""
+    data = None
+    headers = {}
+    if body is not None:
+        data = json.dumps(body).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+
+    start = time.perf_counter()
+    try:
+        with opener.open(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+            server_timing = response.headers.get("Server-Timing", "")
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+        server_timing = e.headers.get("Server-Timing", "")
+    except (urllib.error.URLError, OSError, http.client.HTTPException):
+        status = 0  # Connection failure, timeout or truncated response
+        server_timing = ""
+    elapsed = time.perf_counter() - start
+
+    return status, elapsed, parse_server_timing(server_timing)
+
+
+def parse_server_timing(header):
+    """Parse "name;dur=1.5, other;dur=2" into {name: seconds}"""
+    stages = {}
+    for part in header.split(","):
+        fields = [field.strip() for field in part.split(";")]
+        if not fields[0]:
+            continue
+        for field in fields[1:]:
+            if field.startswith("dur="):
+                stages[fields[0]] = float(field[4:]) / 1000
+    return stages
+
+
+class Recorder:
+    """Thread-safe collection of latency samples and status codes per stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.statuses = {}
+
+    def add(self, stage, seconds, status=None):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+            if status is not None:
+                counts = self.statuses.setdefault(stage, {})
+                counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def fail(self, stage, status):
+        """Count a request that failed without a latency sample"""
+        with self._lock:
+            counts = self.statuses.setdefault(stage, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+
+
+def run_session(base_url, payload, recorder, timeout):
+    """Replay the generate-then-visualize sequence for one user"""
+    opener = urllib.request.build_opener(
+        urllib.request.HTTPCookieProcessor(CookieJar())
+    )
+    start = time.perf_counter()
+
+    status, elapsed, server_stages = timed_request(
+        opener, "POST", base_url + "/generate_weekly_plan", payload, timeout
+    )
+    recorder.add("generate", elapsed, status)
+    for stage, seconds in server_stages.items():
+        recorder.add("server." + stage, seconds)
+
+    # The frontend only asks for charts after a successful plan
+    if status == 200:
+        status, elapsed, _ = timed_request(
+            opener, "GET", base_url + "/get_visualizations_data", timeout=timeout
+        )
+        recorder.add("visualize", elapsed, status)
+
+    recorder.add("session", time.perf_counter() - start)
+
+
+def run_stream_session(base_url, payload, recorder, timeout):
+    """Replay the streamed plan request the frontend makes"""
+    data = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(
+        base_url + "/generate_weekly_plan/stream",
+        data=data,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+
+    start = time.perf_counter()
+    first_day = None
+    status = 0
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            status = response.status
+            for line in response:
+                if line.startswith(b"event: error"):
+                    status = "stream-error"
+                elif line.startswith(b"event: day") and first_day is None:
+                    first_day = time.perf_counter() - start
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except (urllib.error.URLError, OSError, http.client.HTTPException):
+        status = 0  # Connection failure, timeout or truncated stream
+    elapsed = time.perf_counter() - start
+
+    recorder.add("stream", elapsed, status)
+    if first_day is not None:
+        recorder.add("stream.first_day", first_day)
+    recorder.add("session", elapsed)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(recorder, wall_seconds, args, workload_size):
+    stages = {}
+    for stage in sorted(set(recorder.samples) | set(recorder.statuses)):
+        values = sorted(recorder.samples.get(stage, []))
+        summary = {"count": len(values)}
+        if values:
+            summary["mean_ms"] = round(1000 * sum(values) / len(values), 3)
+            summary["max_ms"] = round(1000 * values[-1], 3)
+            for pct in PERCENTILES:
+                summary["p%d_ms" % pct] = round(1000 * percentile(values, pct), 3)
+
+        statuses = recorder.statuses.get(stage)
+        if statuses is not None:
+            errors = sum(n for code, n in statuses.items() if code != "200")
+            summary["statuses"] = statuses
+            summary["error_rate"] = round(errors / sum(statuses.values()), 4)
+        stages[stage] = summary
+
+    requests_sent = sum(
+        len(recorder.samples.get(s, [])) for s in ("generate", "visualize", "stream")
+    )
+    return {
+        "config": run_config(args, workload_size),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput": {
+            "sessions_per_second": round(workload_size / wall_seconds, 2),
+            "requests_per_second": round(requests_sent / wall_seconds, 2),
+        },
+        "stages": stages,
+    }
+
+
+# Settings that must match for two reports to be comparable; the URL may differ
+COMPARABLE_CONFIG = ("concurrency", "sessions", "workload", "warmup", "stream")
+
+
+def run_config(args, workload_size):
+    return {
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "sessions": workload_size,
+        "workload": args.replay or "synthetic(seed=%d)" % args.seed,
+        "warmup": args.warmup,
+        "stream": args.stream,
+    }
+
+
+def config_mismatches(config, baseline):
+    """Return the settings that differ between a run and a baseline report"""
+    return [
+        "%s: %r (baseline) vs %r" % (key, baseline["config"].get(key), config.get(key))
+        for key in COMPARABLE_CONFIG
+        if baseline["config"].get(key) != config.get(key)
+    ]
+
+
+def compare_reports(report, baseline, max_regression, min_delta_ms=1.0):
+    """Return a list of human-readable regressions against a baseline report.
+
+    Latency increases smaller than ``min_delta_ms`` are ignored so sub-millisecond
+    stages do not fail the gate on scheduler noise.
+    """
+    regressions = []
+    for stage, base in baseline["stages"].items():
+        current = report["stages"].get(stage)
+        if current is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            # Stages where every request failed have no latency samples
+            if key not in current or key not in base:
+                continue
+            if (
+                current[key] > base[key] * (1 + max_regression)
+                and current[key] - base[key] >= min_delta_ms
+            ):
+                increase = (
+                    "+%.0f%%" % (100 * (current[key] / base[key] - 1))
+                    if base[key] > 0
+                    else "+%.2f ms" % (current[key] - base[key])
+                )
+                regressions.append(
+                    "%s %s: %.2f -> %.2f (%s)"
+                    % (stage, key, base[key], current[key], increase)
+                )
+        if current.get("error_rate", 0) > base.get("error_rate", 0) + 0.01:
+            regressions.append(
+                "%s error_rate: %.2f%% -> %.2f%%"
+                % (stage, 100 * base["error_rate"], 100 * current["error_rate"])
+            )
+
+    base_rps = baseline["throughput"]["sessions_per_second"]
+    rps = report["throughput"]["sessions_per_second"]
+    if rps < base_rps * (1 - max_regression):
+        regressions.append("throughput: %.2f -> %.2f sessions/s" % (base_rps, rps))
+    return regressions
+
+
+def print_report(report):
+    print(
+        "%d sessions at concurrency %d in %.2fs (%.1f sessions/s, %.1f req/s)"
+        % (
+            report["config"]["sessions"],
+            report["config"]["concurrency"],
+            report["wall_seconds"],
+            report["throughput"]["sessions_per_second"],
+            report["throughput"]["requests_per_second"],
+        )
+    )
+    print(
+        "%-22s %7s %9s %9s %9s %9s %7s"
+        % ("stage", "count", "p50 ms", "p95 ms", "p99 ms", "max ms", "errors")
+    )
+    for stage, summary in report["stages"].items():
+        errors = summary.get("error_rate")
+        latencies = [
+            "-" if key not in summary else "%.2f" % summary[key]
+            for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+        ]
+        print(
+            "%-22s %7d %9s %9s %9s %9s %7s"
+            % (
+                stage,
+                summary["count"],
+                *latencies,
+                "-" if errors is None else "%.1f%%" % (100 * errors),
+            )
+        )
+
+
+def start_app(port):
+    """Start the backend on a local port and wait until it accepts requests"""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "flask",
+            "--app",
+            "diet_engine.web:create_app()",
+            "run",
+            "--port",
+            str(port),
+            "--with-threads",
+            "--no-reload",
+        ],
+        cwd=app_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = "http://127.0.0.1:%d" % port
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url + "/", timeout=1).read()
+            return process, url
+        except (urllib.error.URLError, OSError):
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("The app did not start on port %d" % port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument(
+        "--start-app",
+        action="store_true",
+        help="start the backend locally on --port instead of using --url",
+    )
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--sessions", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="use the streamed plan endpoint instead of generate-then-visualize",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--replay", help="JSONL file of recorded /generate_weekly_plan bodies"
+    )
+    parser.add_argument(
+        "--save-workload", help="write the request mix as JSONL for later replay"
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    workload = load_workload(args)
+
+    # Refuse to gate on a baseline measured under different settings
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        mismatches = config_mismatches(run_config(args, len(workload)), baseline)
+        if mismatches:
+            print("Cannot compare against %s, settings differ:" % args.baseline)
+            for mismatch in mismatches:
+                print("  " + mismatch)
+            return 2
+    if args.save_workload:
+        with open(args.save_workload, "w", encoding="utf-8") as f:
+            for payload in workload:
+                f.write(json.dumps({"payload": payload}) + "\n")
+
+    process = None
+    if args.start_app:
+        process, args.url = start_app(args.port)
+
+    try:
+        base_url = args.url.rstrip("/")
+        run = run_stream_session if args.stream else run_session
+
+        # Warm caches and lazy loading so they do not skew the measurements
+        warmup = Recorder()
+        for payload in workload[: args.warmup]:
+            run(base_url, payload, warmup, args.timeout)
+
+        recorder = Recorder()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [
+                pool.submit(run, base_url, payload, recorder, args.timeout)
+                for payload in workload
+            ]
+        wall_seconds = time.perf_counter() - start
+
+        # A session that raised still counts as a failed request
+        for future in futures:
+            if future.exception() is not None:
+                recorder.fail(
+                    "stream" if args.stream else "generate",
+                    type(future.exception()).__name__,
+                )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = summarize(recorder, wall_seconds, args, len(workload))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare_reports(
+            report, baseline, args.max_regression, args.min_delta_ms
+        )
+        if regressions:
+            print("Regressions against %s:" % args.baseline)
+            for regression in regressions:
+                print("  " + regression)
+            return 1
+        print("No regressions against %s" % args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
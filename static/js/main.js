@@ -47,6 +47,13 @@ document.addEventListener("DOMContentLoaded", function () {
   // Current active day for meal plan
   let currentActiveDay = "";
 
+  // Stable anonymous id so feedback can personalize future plans
+  const userId = getUserId();
+
+  // Plan days and chart data received so far from the plan stream
+  let weeklyPlan = {};
+  let visualizationData = null;
+
   // Set up event listeners
   setupEventListeners();
 
@@ -70,6 +77,19 @@ document.addEventListener("DOMContentLoaded", function () {
       generateRecommendations
     );
 
+    // Weekly plan day tabs
+    weeklyTabButtons.forEach((button) => {
+      button.addEventListener("click", () => {
+        weeklyTabButtons.forEach((button) => {
+          button.classList.remove("active");
+        });
+        button.classList.add("active");
+        if (weeklyPlan[button.innerHTML]) {
+          displayDayMealPlan(weeklyPlan[button.innerHTML]);
+        }
+      });
+    });
+
     // View visualization
     viewVisualizationButton.addEventListener("click", () =>
       switchTab("visualization")
@@ -183,32 +203,98 @@ document.addEventListener("DOMContentLoaded", function () {
       low_fat: lowFatCheckbox.checked,
       high_protein: highProteinCheckbox.checked,
       allergies: allergiesInput.value,
+      user_id: userId,
     };
 
-    // Send request to API - note the updated endpoint name
-    fetch("/generate_weekly_plan", {
+    // Reset any previous plan
+    weeklyPlan = {};
+    visualizationData = null;
+
+    // Stream the plan so each day is shown as soon as it is ready
+    fetch("/generate_weekly_plan/stream", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
       },
       body: JSON.stringify(formData),
     })
-      .then((response) => response.json())
-      .then((data) => {
-        // console.log(data);
-        loadingOverlay.style.display = "none";
-
-        if (data.error) {
-          showError(data.error);
-        } else {
-          displayRecommendations(data);
-          switchTab("recommendations");
+      .then((response) => {
+        if (!response.ok) {
+          return response.json().then((data) => {
+            throw new Error(data.error);
+          });
         }
+        return readEventStream(response, handlePlanEvent);
       })
       .catch((error) => {
         loadingOverlay.style.display = "none";
-        showError("Failed to generate recommendations: " + error);
+        showError("Failed to generate recommendations: " + error.message);
+      });
+  }
+
+  // Handle one event from the plan stream
+  function handlePlanEvent(event, data) {
+    if (event === "day") {
+      const firstDay = Object.keys(weeklyPlan).length === 0;
+      weeklyPlan[data.day] = data.meals;
+
+      if (firstDay) {
+        loadingOverlay.style.display = "none";
+        weeklyTabButtons.forEach((button) => {
+          button.classList.toggle("active", button === weeklyTabButtons[0]);
+        });
+        switchTab("recommendations");
+      }
+
+      weeklyTabButtons.forEach((button) => {
+        button.classList.contains("active") &&
+          button.innerHTML === data.day &&
+          displayDayMealPlan(data.meals);
       });
+    } else if (event === "totals") {
+      displayNutritionTotals(data.nutritional_totals);
+    } else if (event === "visualization") {
+      visualizationData = data;
+    } else if (event === "error") {
+      loadingOverlay.style.display = "none";
+      showError(data.error);
+    }
+  }
+
+  // Read a server-sent event stream, calling onEvent(event, data) per event
+  function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    function pump() {
+      return reader.read().then(({ done, value }) => {
+        if (done) {
+          return;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const frame = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          let event = "message";
+          let data = "";
+          frame.split("\n").forEach((line) => {
+            if (line.startsWith("event: ")) {
+              event = line.slice(7);
+            } else if (line.startsWith("data: ")) {
+              data += line.slice(6);
+            }
+          });
+          onEvent(event, JSON.parse(data));
+        }
+        return pump();
+      });
+    }
+
+    return pump();
   }
 
   // Validate form inputs
@@ -231,10 +317,10 @@ document.addEventListener("DOMContentLoaded", function () {
     return true;
   }
 
-  // Display recommendations
-  function displayRecommendations(data) {
+  // Display nutrition totals of the plan
+  function displayNutritionTotals(nutritionalTotals) {
     // Display nutrition requirements
-    const averageDailyNutritionReq = data.nutritional_totals.daily_average;
+    const averageDailyNutritionReq = nutritionalTotals.daily_average;
     document.getElementById("nutrition-requirements").innerHTML = `
         <p><strong>Daily Calories:</strong> ${averageDailyNutritionReq.calories} kcal</p>
         <p><strong>Protein:</strong> ${averageDailyNutritionReq.protein}g</p>
@@ -243,7 +329,7 @@ document.addEventListener("DOMContentLoaded", function () {
         <p><strong>Fiber:</strong> ${averageDailyNutritionReq.fiber}g</p>
       `;
 
-    const weeklyNutritionReq = data.nutritional_totals.weekly;
+    const weeklyNutritionReq = nutritionalTotals.weekly;
     document.getElementById("nutrition-requirements-weekly").innerHTML = `
         <p><strong>Daily Calories:</strong> ${weeklyNutritionReq.calories} kcal</p>
         <p><strong>Protein:</strong> ${weeklyNutritionReq.protein}g</p>
@@ -251,24 +337,6 @@ document.addEventListener("DOMContentLoaded", function () {
         <p><strong>Fat:</strong> ${weeklyNutritionReq.fat}g</p>
         <p><strong>Fiber:</strong> ${weeklyNutritionReq.fiber}g</p>
       `;
-
-    const firstDay = weeklyTabButtons[0];
-    firstDay.classList.add("active");
-
-    weeklyTabButtons.forEach((button) => {
-      button.addEventListener("click", (evtObj) => {
-        weeklyTabButtons.forEach((button) => {
-          button.classList.remove("active");
-        });
-        button.classList.add("active");
-        displayDayMealPlan(data.weekly_plan[button.innerHTML]);
-      });
-    });
-
-    weeklyTabButtons.forEach((button) => {
-      button.classList.contains("active") &&
-        displayDayMealPlan(data.weekly_plan[button.innerHTML]);
-    });
   }
 
   // Display weekly meal plan in the dedicated divs
@@ -299,6 +367,12 @@ document.addEventListener("DOMContentLoaded", function () {
 
   // Fetch data for visualizations
   function fetchVisualizationData() {
+    // The plan stream already delivered the chart data
+    if (visualizationData) {
+      createVisualizationCharts(visualizationData);
+      return;
+    }
+
     fetch("/get_visualizations_data")
       .then((response) => response.json())
       .then((data) => {
@@ -492,6 +566,16 @@ document.addEventListener("DOMContentLoaded", function () {
     });
   }
 
+  // Get (or create) the anonymous user id kept in local storage
+  function getUserId() {
+    let id = localStorage.getItem("dietUserId");
+    if (!id) {
+      id = Date.now().toString(36) + Math.random().toString(36).slice(2);
+      localStorage.setItem("dietUserId", id);
+    }
+    return id;
+  }
+
   // Show error modal
   function showError(message) {
     errorMessage.textContent = message;